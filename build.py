@@ -4,17 +4,43 @@ Automatyczny skrypt kompilacji dla aplikacji rustExR
 Autor: Projekt rustExR - EXR File Viewer
 """
 
+import hashlib
+import json
 import subprocess
+import shlex
+import shutil
 import sys
 import os
 import time
 import argparse
 from pathlib import Path
 
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    tomllib = None
+
 class RustBuilder:
-    def __init__(self, project_dir="."):
+    # Podkomendy Cargo, które wywołują rustc i mogą korzystać z wrappera
+    COMPILING_SUBCOMMANDS = {"build", "check", "test", "run"}
+    # Katalogi pomijane przy skanowaniu źródeł lokalnych pakietów (oprócz ukrytych)
+    FINGERPRINT_SKIP_DIRS = {"target", "__pycache__"}
+    FINGERPRINT_FILE = ".build-fingerprint.json"
+    
+    def __init__(self, project_dir=".", use_wrapper=True):
         self.project_dir = Path(project_dir).resolve()
         self.cargo_toml = self.project_dir / "Cargo.toml"
+        # Cache kompilacji rustc (sccache/kache), jeśli jest dostępny w PATH
+        self.rustc_wrapper = None
+        if use_wrapper:
+            self.rustc_wrapper = shutil.which("sccache") or shutil.which("kache")
+        self._bin_name_cache = None
+        self._cargo_mtime = None
+        # Wyniki sond cargo/rustc - wyznaczane leniwie, raz na builder
+        self._target_dir = None
+        self._workspace_root = None
+        self._source_dirs = None
+        self._rustc_version = None
         
     def print_header(self, message):
         """Wyświetla nagłówek z ramką"""
@@ -35,11 +61,327 @@ class RustBuilder:
             return False
         return True
         
-    def run_command(self, command, description, live_output=False):
+    def detect_bin_name(self):
+        """Zwraca nazwę pliku wykonywalnego z Cargo.toml (z cache)"""
+        # Cache unieważniany po zmianie czasu modyfikacji Cargo.toml
+        try:
+            mtime = self.cargo_toml.stat().st_mtime_ns
+        except OSError:
+            return None
+        if self._cargo_mtime == mtime:
+            return self._bin_name_cache
+            
+        try:
+            bin_name = self._parse_bin_name()
+        except (OSError, ValueError, AttributeError, TypeError):
+            # Uszkodzony manifest - błąd zgłosi samo cargo, tu tylko nazwa domyślna
+            bin_name = None
+            
+        self._bin_name_cache = bin_name
+        self._cargo_mtime = mtime
+        return self._bin_name_cache
+        
+    def _parse_bin_name(self):
+        """Odczytuje [[bin]].name lub [package].name z Cargo.toml"""
+        bin_name = None
+        package_name = None
+        
+        if tomllib is not None:
+            with open(self.cargo_toml, "rb") as f:
+                data = tomllib.load(f)
+            bins = data.get("bin") or []
+            if bins:
+                bin_name = bins[0].get("name")
+            package_name = data.get("package", {}).get("name")
+        else:
+            # Parser liniowy - automat stanów po nagłówkach sekcji, jedno przejście
+            content = self.cargo_toml.read_bytes().decode("utf-8")
+            section = None
+            for line in content.splitlines():
+                line = line.strip()
+                if line.startswith("["):
+                    if line.startswith("[[bin]]"):
+                        section = "bin"
+                    elif line.startswith("[package]"):
+                        section = "package"
+                    else:
+                        section = "other"
+                    continue
+                    
+                if section not in ("bin", "package") or "=" not in line:
+                    continue
+                key, value = line.split("=", 1)
+                if key.strip() != "name":
+                    continue
+                try:
+                    # shlex obsługuje cudzysłowy, escape'y i komentarze
+                    name = shlex.split(value, comments=True)[0]
+                except (ValueError, IndexError):
+                    continue
+                    
+                if section == "bin" and bin_name is None:
+                    bin_name = name
+                elif section == "package" and package_name is None:
+                    package_name = name
+                    
+        return bin_name or package_name
+        
+    @staticmethod
+    def _available_cpus():
+        """Liczba rdzeni faktycznie dostępnych dla procesu (cgroups/taskset)"""
+        try:
+            return len(os.sched_getaffinity(0))
+        except AttributeError:
+            # sched_getaffinity nie istnieje na Windows/macOS
+            return os.cpu_count() or 1
+            
+    def _cargo_metadata(self, *args):
+        """Uruchamia cargo metadata i zwraca zdekodowany JSON lub None"""
+        try:
+            result = subprocess.run(
+                ["cargo", "metadata", "--format-version", "1", *args],
+                cwd=self.project_dir,
+                capture_output=True,
+                encoding="utf-8",
+                errors="replace",
+                check=True
+            )
+            return json.loads(result.stdout)
+        except (OSError, subprocess.CalledProcessError, ValueError):
+            return None
+            
+    def _load_metadata(self):
+        """Jednorazowo odczytuje katalog target, workspace i lokalne pakiety"""
+        if self._target_dir is not None:
+            return
+            
+        # Pełny graf (bez sieci i bez zmian w Cargo.lock) daje też zależności path
+        data = self._cargo_metadata("--offline", "--locked")
+        try:
+            self._source_dirs = sorted({
+                Path(package["manifest_path"]).parent
+                for package in data["packages"]
+                if package.get("source") is None
+            })
+            self._workspace_root = Path(data["workspace_root"])
+        except (TypeError, KeyError):
+            # Lockfile nieaktualny lub zależności niepobrane - źródła nieznane
+            self._source_dirs = None
+            data = self._cargo_metadata("--no-deps")
+            
+        try:
+            self._target_dir = Path(data["target_directory"])
+        except (TypeError, KeyError):
+            # Brak cargo lub Cargo.toml - przybliżenie domyślnego zachowania cargo
+            # (względny CARGO_TARGET_DIR liczony od cwd, czyli katalogu projektu)
+            target_dir = os.environ.get("CARGO_TARGET_DIR")
+            self._target_dir = (self.project_dir / target_dir if target_dir
+                                else self.project_dir / "target")
+            
+    def target_dir(self):
+        """Zwraca katalog target wg cargo metadata
+        
+        Uwzględnia CARGO_TARGET_DIR i build.target-dir z .cargo/config.toml.
+        """
+        self._load_metadata()
+        return self._target_dir
+        
+    def rustc_version(self):
+        """Zwraca (jednorazowo) wersję toolchaina rustc (pełne wyjście rustc -vV)"""
+        if self._rustc_version is None:
+            try:
+                result = subprocess.run(
+                    ["rustc", "--version", "--verbose"],
+                    cwd=self.project_dir,
+                    capture_output=True,
+                    encoding="utf-8",
+                    errors="replace",
+                    check=True
+                )
+                self._rustc_version = result.stdout.strip()
+            except (OSError, subprocess.CalledProcessError):
+                self._rustc_version = ""
+        return self._rustc_version
+        
+    def is_nightly_toolchain(self):
+        """Sprawdza czy aktywny toolchain to nightly"""
+        return "nightly" in self.rustc_version()
+        
+    def _fingerprint(self, release=True):
+        """Skrót stanu wejść kompilacji: ścieżki, rozmiary i mtime plików
+        
+        Zwraca None, gdy nie da się ustalić wszystkich lokalnych źródeł.
+        """
+        self._load_metadata()
+        if self._source_dirs is None:
+            return None
+            
+        digest = hashlib.blake2b(digest_size=32)
+        digest.update(self.rustc_version().encode("utf-8"))
+        # Wszystkie zmienne RUST*/CARGO* (RUSTFLAGS, CARGO_PROFILE_* itd.) wpływają na wynik
+        env = {key: value for key, value in os.environ.items()
+               if key.startswith(("RUST", "CARGO"))}
+        env.update(self.cargo_env(release))
+        digest.update(json.dumps(env, sort_keys=True).encode("utf-8"))
+        
+        # Konfiguracja Cargo: .cargo/config{,.toml} w projekcie, katalogach nadrzędnych i CARGO_HOME
+        cargo_home = Path(os.environ.get("CARGO_HOME") or Path.home() / ".cargo")
+        config_dirs = [d / ".cargo" for d in (self.project_dir, *self.project_dir.parents)]
+        config_dirs.append(cargo_home)
+        for config_dir in dict.fromkeys(config_dirs):
+            for name in ("config", "config.toml"):
+                try:
+                    st = (config_dir / name).stat()
+                except OSError:
+                    continue
+                digest.update(f"{config_dir / name}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8"))
+                
+        # Źródła wszystkich lokalnych pakietów (członkowie workspace i zależności
+        # path) oraz Cargo.toml/Cargo.lock z korzenia workspace
+        entries = set()
+        target_dir = self.target_dir()
+        stack = list(self._source_dirs)
+        for name in ("Cargo.toml", "Cargo.lock"):
+            try:
+                st = (self._workspace_root / name).stat()
+            except OSError:
+                continue
+            entries.add(f"{self._workspace_root / name}\0{st.st_size}\0{st.st_mtime_ns}")
+            
+        while stack:
+            path = stack.pop()
+            if path == target_dir:
+                continue
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if entry.name.startswith(".") or entry.name in self.FINGERPRINT_SKIP_DIRS:
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(Path(entry.path))
+                        else:
+                            st = entry.stat()
+                            entries.add(f"{entry.path}\0{st.st_size}\0{st.st_mtime_ns}")
+            except OSError:
+                continue
+                
+        for line in sorted(entries):
+            digest.update(f"{line}\n".encode("utf-8"))
+            
+        return digest.hexdigest()
+        
+    @staticmethod
+    def _file_hash(path):
+        """Skrót zawartości pliku (blake2b)"""
+        digest = hashlib.blake2b(digest_size=32)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+        
+    def _fingerprint_path(self, release=True):
+        return self.exe_path(release).parent / self.FINGERPRINT_FILE
+        
+    def is_build_up_to_date(self, fingerprint, release=True):
+        """Sprawdza czy zapisany odcisk kompilacji pasuje do bieżących wejść"""
+        try:
+            saved = json.loads(self._fingerprint_path(release).read_bytes())
+            return (saved.get("fingerprint") == fingerprint
+                    and saved.get("exe_hash") == self._file_hash(self.exe_path(release)))
+        except (OSError, ValueError, AttributeError):
+            return False
+            
+    def save_fingerprint(self, fingerprint, release=True):
+        """Zapisuje odcisk kompilacji obok pliku wykonywalnego"""
+        try:
+            data = {
+                "fingerprint": fingerprint,
+                "exe_hash": self._file_hash(self.exe_path(release)),
+            }
+            self._fingerprint_path(release).write_text(json.dumps(data, indent=2), encoding="utf-8")
+        except OSError as e:
+            print(f"⚠️  Nie udało się zapisać odcisku kompilacji: {e}")
+        
+    def cargo_env(self, release=True):
+        """Zwraca zmienne środowiskowe dla równoległej kompilacji Cargo"""
+        jobs = self._available_cpus()
+        env = {
+            "CARGO_BUILD_JOBS": os.environ.get("CARGO_BUILD_JOBS", str(jobs)),
+            # Release to kompilacja jednorazowa - cache przyrostowy tylko ją spowalnia
+            "CARGO_INCREMENTAL": os.environ.get("CARGO_INCREMENTAL", "0" if release else "1"),
+        }
+        
+        # Równoległy front-end rustc (tylko nightly). RUSTFLAGS zastępuje rustflags
+        # z .cargo/config.toml, więc dopisujemy się tylko do flag ustawionych przez
+        # użytkownika - w pozostałych przypadkach patrz rustflags_args()
+        if self.is_nightly_toolchain():
+            encoded = os.environ.get("CARGO_ENCODED_RUSTFLAGS")
+            rustflags = os.environ.get("RUSTFLAGS")
+            if encoded and "-Zthreads" not in encoded:
+                env["CARGO_ENCODED_RUSTFLAGS"] = f"{encoded}\x1f-Zthreads={jobs}"
+            elif not encoded and rustflags and "-Zthreads" not in rustflags:
+                env["RUSTFLAGS"] = f"{rustflags} -Zthreads={jobs}"
+                
+        return env
+        
+    def rustflags_args(self):
+        """Argumenty cargo włączające równoległy front-end, gdy flagi nie są w env"""
+        # --config dokleja się do tablicy build.rustflags z plików konfiguracyjnych
+        # zamiast ją zastępować (jak robi to zmienna RUSTFLAGS)
+        if (not self.is_nightly_toolchain() or os.environ.get("RUSTFLAGS")
+                or os.environ.get("CARGO_ENCODED_RUSTFLAGS")):
+            return []
+        return ["--config", f'build.rustflags=["-Zthreads={self._available_cpus()}"]']
+        
+    def command_env(self, command, env=None):
+        """Buduje środowisko procesu lub None, jeśli wystarczy bieżące"""
+        # Wrapper rustc tylko dla komend, które faktycznie kompilują
+        if (self.rustc_wrapper and len(command) > 1 and command[0] == "cargo"
+                and command[1] in self.COMPILING_SUBCOMMANDS
+                and "RUSTC_WRAPPER" not in os.environ):
+            env = dict(env or {}, RUSTC_WRAPPER=self.rustc_wrapper)
+            
+        # Dodatkowe zmienne środowiskowe nakładane na bieżące środowisko
+        if not env:
+            return None
+        full_env = os.environ.copy()
+        full_env.update(env)
+        return full_env
+        
+    @staticmethod
+    def print_diagnostic_line(line, counts):
+        """Obsługuje linię wyjścia cargo --message-format=json-diagnostic-short
+        
+        Zwraca zdekodowany komunikat cargo lub None dla zwykłego tekstu.
+        """
+        try:
+            message = json.loads(line)
+        except ValueError:
+            message = None
+        if not isinstance(message, dict):
+            # Zwykły tekst (np. "Compiling ..." ze stderr cargo), także taki,
+            # który przypadkiem jest poprawnym JSON-em (liczba, true, "...")
+            print(line, end="")
+            return None
+            
+        if message.get("reason") != "compiler-message":
+            return message
+        diagnostic = message.get("message") or {}
+        level = diagnostic.get("level", "")
+        if level.startswith("error"):
+            counts["error"] += 1
+            print(diagnostic.get("rendered") or diagnostic.get("message", ""), end="")
+        elif level == "warning":
+            counts["warning"] += 1
+        return message
+            
+    def run_command(self, command, description, live_output=False, env=None, json_diagnostics=False):
         """Uruchamia komendę i zwraca wynik"""
         print(f"🔄 {description}...")
         print(f"   Komenda: {' '.join(command)}")
         
+        full_env = self.command_env(command, env)
+        
         start_time = time.time()
         
         try:
@@ -48,43 +390,51 @@ class RustBuilder:
                 result = subprocess.run(
                     command,
                     cwd=self.project_dir,
+                    env=full_env,
                     check=True
                 )
                 elapsed = time.time() - start_time
                 print(f"✅ {description} ukończone w {elapsed:.2f}s")
                 return True, result
-            else:
-                # Standardowy tryb z przechwyceniem wyjścia
-                result = subprocess.run(
-                    command,
-                    cwd=self.project_dir,
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-            
+                
+            # Strumieniowanie wyjścia linia po linii (stdout + stderr w jednym potoku)
+            with subprocess.Popen(
+                command,
+                cwd=self.project_dir,
+                env=full_env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                # Cargo zawsze pisze w UTF-8 (np. spans[].text z emoji w źródłach);
+                # kodek locale (np. cp1250 na Windows) by się na tym wywrócił
+                encoding="utf-8",
+                errors="replace",
+                bufsize=1
+            ) as proc:
+                # Przy diagnostyce JSON pokazujemy tylko błędy, ostrzeżenia są zliczane
+                counts = {"error": 0, "warning": 0}
+                for line in proc.stdout:
+                    if json_diagnostics:
+                        self.print_diagnostic_line(line, counts)
+                    else:
+                        print(line, end="")
+                proc.wait()
+                
+            if json_diagnostics:
+                print(f"📊 Diagnostyka: błędy: {counts['error']}, ostrzeżenia: {counts['warning']}")
+                
             elapsed = time.time() - start_time
-            print(f"✅ {description} ukończone w {elapsed:.2f}s")
-            
-            if result.stdout:
-                print("📋 Stdout:")
-                print(result.stdout)
+            if proc.returncode != 0:
+                print(f"❌ {description} nie powiodło się po {elapsed:.2f}s")
+                print(f"   Kod błędu: {proc.returncode}")
+                return False, proc
                 
-            return True, result
+            print(f"✅ {description} ukończone w {elapsed:.2f}s")
+            return True, proc
             
         except subprocess.CalledProcessError as e:
             elapsed = time.time() - start_time
             print(f"❌ {description} nie powiodło się po {elapsed:.2f}s")
             print(f"   Kod błędu: {e.returncode}")
-            
-            if e.stdout:
-                print("📋 Stdout:")
-                print(e.stdout)
-                
-            if e.stderr:
-                print("🚨 Stderr:")
-                print(e.stderr)
-                
             return False, e
             
         except Exception as e:
@@ -103,7 +453,7 @@ class RustBuilder:
         
         if success:
             # Sprawdź czy folder target został usunięty
-            target_dir = self.project_dir / "target"
+            target_dir = self.target_dir()
             if target_dir.exists():
                 print(f"⚠️  Folder target nadal istnieje: {target_dir}")
             else:
@@ -111,33 +461,50 @@ class RustBuilder:
                 
         return success
         
-    def build_project(self, release=True):
-        """Kompiluje projekt"""
+    def exe_path(self, release=True):
+        """Zwraca ścieżkę do pliku wykonywalnego dla danego profilu"""
+        bin_name = self.detect_bin_name() or "rustexr"
+        exe_name = f"{bin_name}.exe" if os.name == "nt" else bin_name
+        exe_dir = "release" if release else "debug"
+        return self.target_dir() / exe_dir / exe_name
+        
+    def build_project(self, release=True, force=False):
+        """Kompiluje projekt (pomija cargo, jeśli wejścia się nie zmieniły)"""
         mode = "release" if release else "debug"
+        exe_path = self.exe_path(release)
         self.print_step("2", f"Kompilacja projektu (tryb: {mode})")
         
-        command = ["cargo", "build"]
+        fingerprint = self._fingerprint(release)
+        if fingerprint is None:
+            print("ℹ️  Cache kompilacji wyłączony - nie udało się ustalić źródeł (cargo metadata)")
+        elif not force and self.is_build_up_to_date(fingerprint, release):
+            print(f"⚡ Cache hit - brak zmian od ostatniej kompilacji: {exe_path}")
+            return True
+            
+        command = ["cargo", "build", *self.rustflags_args(), "--message-format=json-diagnostic-short"]
         if release:
             command.append("--release")
             
         success, result = self.run_command(
             command,
             f"Kompilacja w trybie {mode}",
-            live_output=True  # Zawsze pokazuj live podgląd dla kompilacji
+            env=self.cargo_env(release),
+            json_diagnostics=True  # Postęp na żywo, z diagnostyki tylko błędy
         )
         
         if success:
-            # Sprawdź czy plik wykonywalny został utworzony
-            exe_name = "rustexr.exe" if os.name == "nt" else "rustexr"
-            exe_dir = "release" if release else "debug"
-            exe_path = self.project_dir / "target" / exe_dir / exe_name
-            
-            if exe_path.exists():
+            # Sprawdź czy plik wykonywalny został utworzony (jedno wywołanie stat)
+            try:
                 size = exe_path.stat().st_size / (1024 * 1024)  # MB
+            except FileNotFoundError:
+                print(f"⚠️  Nie znaleziono pliku wykonywalnego: {exe_path}")
+            else:
                 print(f"📦 Plik wykonywalny utworzony: {exe_path}")
                 print(f"   Rozmiar: {size:.2f} MB")
-            else:
-                print(f"⚠️  Nie znaleziono pliku wykonywalnego: {exe_path}")
+                # Zapisz odcisk tylko, gdy wejścia nie zmieniły się w trakcie kompilacji
+                # (pierwsza kompilacja może np. utworzyć Cargo.lock)
+                if fingerprint is not None and self._fingerprint(release) == fingerprint:
+                    self.save_fingerprint(fingerprint, release)
                 
         return success
         
@@ -146,8 +513,12 @@ class RustBuilder:
         self.print_step("2", "Sprawdzanie składni i typów")
         
         success, result = self.run_command(
-            ["cargo", "check"],
-            "Sprawdzanie składni"
+            ["cargo", "check", *self.rustflags_args(), "--message-format=json-diagnostic-short"],
+            "Sprawdzanie składni",
+            # Te same RUSTFLAGS co kompilacja debug (profil dev), aby nie
+            # przebudowywać skryptów build i proc-macro przy przełączaniu
+            env=self.cargo_env(release=False),
+            json_diagnostics=True
         )
         
         return success
@@ -156,25 +527,39 @@ class RustBuilder:
         """Uruchamia testy"""
         self.print_step("3", "Uruchamianie testów")
         
+        # Równoległa kompilacja i wykonywanie testów. Zawsze profil dev: release
+        # ma panic = "abort", a harness testów wymaga unwind, więc --release i tak
+        # przebudowałby wszystkie zależności (z LTO i codegen-units = 1)
+        # Liczbę zadań kompilacji ustala CARGO_BUILD_JOBS z cargo_env(); liczbę wątków
+        # testów podajemy tylko, gdy użytkownik nie ustawił RUST_TEST_THREADS
+        command = ["cargo", "test", *self.rustflags_args()]
+        if not os.environ.get("RUST_TEST_THREADS"):
+            command += ["--", "--test-threads", str(self._available_cpus())]
+        
         success, result = self.run_command(
-            ["cargo", "test"],
-            "Uruchamianie testów jednostkowych"
+            command,
+            "Uruchamianie testów jednostkowych",
+            env=self.cargo_env(release=False)
         )
         
         return success
         
     def run_application(self, example=None, release=True):
-        """Uruchamia aplikację"""
+        """Kompiluje (jeśli trzeba) i uruchamia aplikację jednym wywołaniem cargo run"""
         if example:
             self.print_step("4", f"Uruchamianie przykładu: {example}")
-            command = ["cargo", "run", "--example", example]
+            command = ["cargo", "run", *self.rustflags_args(), "--example", example]
             description = f"Uruchamianie przykładu {example}"
         else:
             self.print_step("4", "Uruchamianie głównej aplikacji")
-            command = ["cargo", "run"]
+            command = ["cargo", "run", *self.rustflags_args()]
+            bin_name = self.detect_bin_name()
+            if bin_name:
+                command += ["--bin", bin_name]
             description = "Uruchamianie głównej aplikacji"
             
-        # Dodaj flagę release jeśli potrzebna
+        # Diagnostyka JSON pozwala odróżnić błąd kompilacji od błędu aplikacji
+        command.append("--message-format=json-diagnostic-short")
         if release:
             command.append("--release")
             
@@ -182,20 +567,45 @@ class RustBuilder:
         print(f"   Komenda: {' '.join(command)}")
         print("   (Naciśnij Ctrl+C aby zatrzymać aplikację)")
         
+        counts = {"error": 0, "warning": 0}
+        build_ok = None  # None dopóki cargo nie zgłosi "build-finished"
         try:
-            # Uruchom aplikację bez przechwytywania wyjścia
-            subprocess.run(
+            # To samo środowisko co w build_project, aby Cargo nie unieważniło
+            # skompilowanych artefaktów
+            with subprocess.Popen(
                 command,
                 cwd=self.project_dir,
-                check=True
-            )
+                env=self.command_env(command, self.cargo_env(release)),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                encoding="utf-8",
+                errors="replace",
+                bufsize=1
+            ) as proc:
+                for line in proc.stdout:
+                    if build_ok is not None:
+                        # Wyjście samej aplikacji - bez interpretacji
+                        print(line, end="")
+                        continue
+                    message = self.print_diagnostic_line(line, counts)
+                    if isinstance(message, dict) and message.get("reason") == "build-finished":
+                        build_ok = bool(message.get("success"))
+                        print(f"📊 Diagnostyka: błędy: {counts['error']}, ostrzeżenia: {counts['warning']}")
+                proc.wait()
         except KeyboardInterrupt:
             print("\n🛑 Aplikacja zatrzymana przez użytkownika")
-        except subprocess.CalledProcessError as e:
-            print(f"\n❌ Aplikacja zakończyła się błędem (kod: {e.returncode})")
+            return True
+            
+        if proc.returncode == 0:
+            return True
+        if build_ok:
+            print(f"\n❌ Aplikacja zakończyła się błędem (kod: {proc.returncode})")
+        else:
+            print(f"\n❌ Kompilacja/uruchomienie nie powiodło się (kod: {proc.returncode})")
+        return False
             
-    def full_build_and_run(self, release=True, run_tests=False, example=None, verbose=False):
-        """Pełny proces: czyszczenie, kompilacja i uruchomienie"""
+    def full_build_and_run(self, release=True, run_tests=False, example=None, verbose=False, clean=False, force=False, run=False):
+        """Pełny proces: (opcjonalne) czyszczenie, kompilacja i uruchomienie"""
         self.print_header("🔨 AUTOMATYCZNA KOMPILACJA PROJEKTU RUSTEXR")
         
         if not self.check_cargo_project():
@@ -203,17 +613,22 @@ class RustBuilder:
             
         print(f"📁 Katalog projektu: {self.project_dir}")
         print(f"🦀 Tryb kompilacji: {'release' if release else 'debug'}")
+        toolchain = self.rustc_version().split("\n", 1)[0] or "nieznany"
+        print(f"🧰 Toolchain: {toolchain}")
         print(f"🧪 Testy: {'tak' if run_tests else 'nie'}")
+        print(f"🗑️  Czyszczenie: {'tak' if clean else 'nie (kompilacja przyrostowa)'}")
+        print(f"💾 Wrapper rustc: {self.rustc_wrapper or 'brak'}")
+        print(f"🚀 Uruchomienie: {'tak' if run else 'nie'}")
         if example:
             print(f"📝 Przykład: {example}")
             
-        # Krok 1: Czyszczenie
-        if not self.clean_build(verbose=verbose):
+        # Krok 1: Czyszczenie (tylko na żądanie - domyślnie korzystamy z cache Cargo)
+        if clean and not self.clean_build(verbose=verbose):
             print("\n❌ Proces przerwany na etapie czyszczenia")
             return False
             
-        # Krok 2: Kompilacja
-        if not self.build_project(release):
+        # Krok 2: Kompilacja - przy uruchomieniu wykonuje ją cargo run (krok 4)
+        if not run and not self.build_project(release, force=force):
             print("\n❌ Proces przerwany na etapie kompilacji")
             return False
             
@@ -222,14 +637,12 @@ class RustBuilder:
             if not self.run_tests():
                 print("\n⚠️  Testy nie przeszły, ale kontynuujemy...")
                 
-        # Krok 4: Uruchomienie
-        print("\n🎯 Kompilacja zakończona pomyślnie!")
-        
-        response = input("\n❓ Czy chcesz uruchomić aplikację? (t/n): ").strip().lower()
-        if response in ['t', 'tak', 'y', 'yes']:
-            self.run_application(example, release=release)
+        if not run:
+            print("\n🎯 Kompilacja zakończona pomyślnie!")
+            return True
             
-        return True
+        # Krok 4: Kompilacja i uruchomienie w jednym wywołaniu cargo
+        return self.run_application(example, release=release)
 
 
 def main():
@@ -238,13 +651,21 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Przykłady użycia:
-  python build.py                    # Standardowa kompilacja RELEASE
+  python build.py                    # Standardowa kompilacja RELEASE (przyrostowa)
+  python build.py --clean            # Kompilacja RELEASE od zera (cargo clean)
   python build.py --debug            # Kompilacja debug
   python build.py --verbose          # Kompilacja z pełnym podglądem
-  python build.py --check-only       # Tylko sprawdzenie składni
+  python build.py --check-only       # Tylko sprawdzenie składni (przyrostowe)
   python build.py --run-tests        # Kompilacja z testami
-  python build.py --example simple   # Kompilacja i uruchomienie przykładu
+  python build.py --run              # Kompilacja i uruchomienie bez pytania
+  python build.py --no-run           # Tylko kompilacja (np. w CI)
+  python build.py --example simple   # Kompilacja i uruchomienie przykładu (oznacza --run)
+  python build.py --force            # Kompilacja nawet bez zmian w źródłach
   python build.py --clean-only       # Tylko czyszczenie
+
+Domyślnie kompilacja jest przyrostowa - Cargo ponownie wykorzystuje
+niezmienione artefakty z katalogu 'target'. Użyj --clean, aby wymusić
+pełną kompilację od zera (dotyczy również --check-only).
         """
     )
     
@@ -266,6 +687,18 @@ Przykłady użycia:
         help="Tylko sprawdź składnię, nie kompiluj"
     )
     
+    parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="Wyczyść cache kompilacji przed kompilacją (domyślnie: kompilacja przyrostowa)"
+    )
+    
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Wymuś wywołanie cargo build, nawet jeśli źródła się nie zmieniły"
+    )
+    
     parser.add_argument(
         "--clean-only",
         action="store_true",
@@ -278,10 +711,28 @@ Przykłady użycia:
         help="Uruchom testy po kompilacji"
     )
     
+    run_group = parser.add_mutually_exclusive_group()
+    run_group.add_argument(
+        "--run",
+        action="store_true",
+        help="Uruchom aplikację po kompilacji bez pytania"
+    )
+    run_group.add_argument(
+        "--no-run",
+        action="store_true",
+        help="Nie uruchamiaj aplikacji (domyślnie, gdy wejście nie jest terminalem)"
+    )
+    
     parser.add_argument(
         "--example",
         type=str,
-        help="Uruchom konkretny przykład zamiast głównej aplikacji"
+        help="Skompiluj i uruchom konkretny przykład zamiast głównej aplikacji (oznacza --run)"
+    )
+    
+    parser.add_argument(
+        "--no-wrapper",
+        action="store_true",
+        help="Nie używaj sccache/kache jako RUSTC_WRAPPER, nawet jeśli są dostępne"
     )
     
     parser.add_argument(
@@ -293,10 +744,14 @@ Przykłady użycia:
     
     args = parser.parse_args()
     
-    # Tworzenie buildera
-    builder = RustBuilder(args.project_dir)
+    # Przykład jest kompilowany wyłącznie przez cargo run
+    if args.example and args.no_run:
+        parser.error("argument --example: nie można łączyć z --no-run")
     
     try:
+        # Tworzenie buildera
+        builder = RustBuilder(args.project_dir, use_wrapper=not args.no_wrapper)
+        
         if args.clean_only:
             # Tylko czyszczenie
             builder.print_header("🗑️  CZYSZCZENIE CACHE KOMPILACJI")
@@ -310,17 +765,33 @@ Przykłady użycia:
             builder.print_header("🔍 SPRAWDZANIE SKŁADNI PROJEKTU")
             if not builder.check_cargo_project():
                 sys.exit(1)
-            builder.clean_build()
+            if args.clean and not builder.clean_build():
+                sys.exit(1)
             success = builder.check_project()
             sys.exit(0 if success else 1)
             
         else:
+            if not builder.check_cargo_project():
+                sys.exit(1)
+                
+            # Przykład zawsze jest uruchamiany; o aplikację pytamy tylko w sesji
+            # interaktywnej (CI nie może się zawiesić)
+            should_run = args.run or bool(args.example) or (
+                not args.no_run
+                and sys.stdin.isatty()
+                and input("\n❓ Czy chcesz uruchomić aplikację po kompilacji? (t/n): ").strip().lower()
+                in {'t', 'tak', 'y', 'yes'}
+            )
+            
             # Pełny proces
             success = builder.full_build_and_run(
                 release=not args.debug,  # Domyślnie release, chyba że --debug
                 run_tests=args.run_tests,
                 example=args.example,
-                verbose=args.verbose
+                verbose=args.verbose,
+                clean=args.clean,
+                force=args.force,
+                run=should_run
             )
             sys.exit(0 if success else 1)
             